@@ -17,6 +17,9 @@
 
 
 import logging
+import types
+import typing as t
+from operator import attrgetter
 
 import pytest
 
@@ -27,310 +30,292 @@ from neo4j._conf import PoolConfig
 from neo4j.exceptions import ConfigurationError
 
 from ...._async_compat import mark_async_test
+from .conftest import prepack_message
 
 
+MAX_CONNECTION_LIFETIME = PoolConfig.max_connection_lifetime
+AUTH = neo4j.Auth("basic", "alice123", "supersecret123")
+
+TAG_HELLO = b"\x01"
+TAG_RUN = b"\x10"
+TAG_BEGIN = b"\x11"
+TAG_DISCARD = b"\x2F"
+TAG_PULL = b"\x3F"
+TAG_LOGON = b"\x6A"
+TAG_LOGOFF = b"\x6B"
+TAG_SUCCESS = b"\x70"
+TAG_FAILURE = b"\x7F"
+
+
+HELLO_SUCCESS_BYTES = prepack_message(
+    AsyncBolt5x1.PACKER_CLS, TAG_SUCCESS, {"server": "Neo4j/4.4.0"}
+)
+SUCCESS_BYTES = prepack_message(AsyncBolt5x1.PACKER_CLS, TAG_SUCCESS, {})
+FAILURE_BYTES = prepack_message(
+    AsyncBolt5x1.PACKER_CLS, TAG_FAILURE,
+    {"code": "Neo.DatabaseError.General.MadeUpError", "message": "kthxbye"}
+)
+
+
+class _RecordingHandler(logging.Handler):
+    """Keep log records without formatting them until they are inspected."""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    @property
+    def messages(self):
+        return [record.getMessage() for record in self.records]
+
+
+@pytest.fixture
+def capture_neo4j_log():
+    logger = logging.getLogger("neo4j")
+    level, propagate = logger.level, logger.propagate
+    handlers = []
+
+    def capture(capture_level):
+        handler = _RecordingHandler()
+        handlers.append(handler)
+        logger.addHandler(handler)
+        logger.setLevel(capture_level)
+        logger.propagate = False
+        return handler
+
+    yield capture
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = propagate
+
+
+@pytest.fixture(scope="module")
+def address():
+    return neo4j.Address(("127.0.0.1", 7687))
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr("neo4j._async.io._bolt.perf_counter", lambda: 0.0)
+
+
+@pytest.fixture
+def make_conn(fake_socket, address):
+    def factory(max_connection_lifetime=MAX_CONNECTION_LIFETIME, **kwargs):
+        socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
+        connection = AsyncBolt5x1(
+            address, socket, max_connection_lifetime, **kwargs
+        )
+        return connection, socket
+
+    return factory
+
+
+@pytest.fixture(scope="module")
+def dummy_conn(fake_socket, address):
+    # only for calls that are rejected before touching connection state
+    return AsyncBolt5x1(address, fake_socket(address), MAX_CONNECTION_LIFETIME)
+
+
+@pytest.fixture(scope="module")
+def noop_pool():
+    async def on_neo4j_error(*args, **kwargs):
+        return
+
+    return types.SimpleNamespace(on_neo4j_error=on_neo4j_error)
+
+
+@pytest.fixture
+def sockets(fake_socket_pair, address):
+    return fake_socket_pair(address,
+                            packer_cls=AsyncBolt5x1.PACKER_CLS,
+                            unpacker_cls=AsyncBolt5x1.UNPACKER_CLS)
+
+
+@pytest.fixture
+def hello_ok_sockets(sockets):
+    sockets.server.send_prepacked(HELLO_SUCCESS_BYTES + SUCCESS_BYTES)
+    return sockets
+
+
+@pytest.fixture
+def failure_sockets(sockets):
+    sockets.server.send_prepacked(FAILURE_BYTES)
+    return sockets
+
+
+@pytest.mark.usefixtures("frozen_clock")
 @pytest.mark.parametrize("set_stale", (True, False))
-def test_conn_is_stale(fake_socket, set_stale):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    max_connection_lifetime = 0
-    connection = AsyncBolt5x1(address, fake_socket(address),
-                              max_connection_lifetime)
+def test_conn_is_stale(make_conn, set_stale):
+    connection, _ = make_conn(max_connection_lifetime=0)
     if set_stale:
         connection.set_stale()
     assert connection.stale() is True
 
 
+@pytest.mark.usefixtures("frozen_clock")
 @pytest.mark.parametrize("set_stale", (True, False))
-def test_conn_is_not_stale_if_not_enabled(fake_socket, set_stale):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    max_connection_lifetime = -1
-    connection = AsyncBolt5x1(address, fake_socket(address),
-                              max_connection_lifetime)
+def test_conn_is_not_stale_if_not_enabled(make_conn, set_stale):
+    connection, _ = make_conn(max_connection_lifetime=-1)
     if set_stale:
         connection.set_stale()
     assert connection.stale() is set_stale
 
 
+@pytest.mark.usefixtures("frozen_clock")
 @pytest.mark.parametrize("set_stale", (True, False))
-def test_conn_is_not_stale(fake_socket, set_stale):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    max_connection_lifetime = 999999999
-    connection = AsyncBolt5x1(address, fake_socket(address),
-                              max_connection_lifetime)
+def test_conn_is_not_stale(make_conn, set_stale):
+    connection, _ = make_conn(max_connection_lifetime=999999999)
     if set_stale:
         connection.set_stale()
     assert connection.stale() is set_stale
 
 
-@pytest.mark.parametrize(("args", "kwargs", "expected_fields"), (
-    (("", {}), {"db": "something"}, ({"db": "something"},)),
-    (("", {}), {"imp_user": "imposter"}, ({"imp_user": "imposter"},)),
+@pytest.mark.parametrize(("method", "tag", "kwargs", "expected_fields"), (
+    ("begin", TAG_BEGIN, {"db": "something"}, ({"db": "something"},)),
+    (
+        "begin", TAG_BEGIN,
+        {"imp_user": "imposter"},
+        ({"imp_user": "imposter"},)
+    ),
     (
-        ("", {}),
+        "begin", TAG_BEGIN,
         {"db": "something", "imp_user": "imposter"},
         ({"db": "something", "imp_user": "imposter"},)
     ),
-))
-@mark_async_test
-async def test_extra_in_begin(fake_socket, args, kwargs, expected_fields):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                              PoolConfig.max_connection_lifetime)
-    connection.begin(*args, **kwargs)
-    await connection.send_all()
-    tag, is_fields = await socket.pop_message()
-    assert tag == b"\x11"
-    assert tuple(is_fields) == expected_fields
-
-
-@pytest.mark.parametrize(("args", "kwargs", "expected_fields"), (
-    (("", {}), {"db": "something"}, ("", {}, {"db": "something"})),
-    (("", {}), {"imp_user": "imposter"}, ("", {}, {"imp_user": "imposter"})),
+    ("run", TAG_RUN, {"db": "something"}, ("", {}, {"db": "something"})),
+    (
+        "run", TAG_RUN,
+        {"imp_user": "imposter"},
+        ("", {}, {"imp_user": "imposter"})
+    ),
     (
-        ("", {}),
+        "run", TAG_RUN,
         {"db": "something", "imp_user": "imposter"},
         ("", {}, {"db": "something", "imp_user": "imposter"})
     ),
 ))
 @mark_async_test
-async def test_extra_in_run(fake_socket, args, kwargs, expected_fields):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                              PoolConfig.max_connection_lifetime)
-    connection.run(*args, **kwargs)
-    await connection.send_all()
-    tag, is_fields = await socket.pop_message()
-    assert tag == b"\x10"
-    assert tuple(is_fields) == expected_fields
-
-
-@mark_async_test
-async def test_n_extra_in_discard(fake_socket):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                              PoolConfig.max_connection_lifetime)
-    connection.discard(n=666)
-    await connection.send_all()
-    tag, fields = await socket.pop_message()
-    assert tag == b"\x2F"
-    assert len(fields) == 1
-    assert fields[0] == {"n": 666}
-
-
-@pytest.mark.parametrize(
-    "test_input, expected",
-    [
-        (666, {"n": -1, "qid": 666}),
-        (-1, {"n": -1}),
-    ]
-)
-@mark_async_test
-async def test_qid_extra_in_discard(fake_socket, test_input, expected):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                              PoolConfig.max_connection_lifetime)
-    connection.discard(qid=test_input)
-    await connection.send_all()
-    tag, fields = await socket.pop_message()
-    assert tag == b"\x2F"
-    assert len(fields) == 1
-    assert fields[0] == expected
-
-
-@pytest.mark.parametrize(
-    "test_input, expected",
-    [
-        (777, {"n": 666, "qid": 777}),
-        (-1, {"n": 666}),
-    ]
-)
-@mark_async_test
-async def test_n_and_qid_extras_in_discard(fake_socket, test_input, expected):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                              PoolConfig.max_connection_lifetime)
-    connection.discard(n=666, qid=test_input)
+async def test_extras_downstream(make_conn, method, tag, kwargs,
+                                 expected_fields):
+    connection, socket = make_conn()
+    getattr(connection, method)("", {}, **kwargs)
     await connection.send_all()
-    tag, fields = await socket.pop_message()
-    assert tag == b"\x2F"
-    assert len(fields) == 1
-    assert fields[0] == expected
-
-
-@pytest.mark.parametrize(
-    "test_input, expected",
-    [
-        (666, {"n": 666}),
-        (-1, {"n": -1}),
-    ]
-)
-@mark_async_test
-async def test_n_extra_in_pull(fake_socket, test_input, expected):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                              PoolConfig.max_connection_lifetime)
-    connection.pull(n=test_input)
-    await connection.send_all()
-    tag, fields = await socket.pop_message()
-    assert tag == b"\x3F"
-    assert len(fields) == 1
-    assert fields[0] == expected
-
-
-@pytest.mark.parametrize(
-    "test_input, expected",
-    [
-        (777, {"n": -1, "qid": 777}),
-        (-1, {"n": -1}),
-    ]
-)
+    is_tag, is_fields = await socket.pop_message()
+    assert is_tag == tag
+    assert is_fields == expected_fields
+
+
+@pytest.mark.parametrize(("method", "tag", "kwargs", "expected"), (
+    ("discard", TAG_DISCARD, {"n": 666}, {"n": 666}),
+    ("discard", TAG_DISCARD, {"qid": 666}, {"n": -1, "qid": 666}),
+    ("discard", TAG_DISCARD, {"qid": -1}, {"n": -1}),
+    ("discard", TAG_DISCARD, {"n": 666, "qid": 777}, {"n": 666, "qid": 777}),
+    ("discard", TAG_DISCARD, {"n": 666, "qid": -1}, {"n": 666}),
+    ("pull", TAG_PULL, {"n": 666}, {"n": 666}),
+    ("pull", TAG_PULL, {"n": -1}, {"n": -1}),
+    ("pull", TAG_PULL, {"qid": 777}, {"n": -1, "qid": 777}),
+    ("pull", TAG_PULL, {"qid": -1}, {"n": -1}),
+    ("pull", TAG_PULL, {"n": 666, "qid": 777}, {"n": 666, "qid": 777}),
+))
 @mark_async_test
-async def test_qid_extra_in_pull(fake_socket, test_input, expected):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                              PoolConfig.max_connection_lifetime)
-    connection.pull(qid=test_input)
+async def test_n_qid_extras(make_conn, method, tag, kwargs, expected):
+    connection, socket = make_conn()
+    getattr(connection, method)(**kwargs)
     await connection.send_all()
-    tag, fields = await socket.pop_message()
-    assert tag == b"\x3F"
+    is_tag, fields = await socket.pop_message()
+    assert is_tag == tag
     assert len(fields) == 1
     assert fields[0] == expected
 
 
 @mark_async_test
-async def test_n_and_qid_extras_in_pull(fake_socket):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                              PoolConfig.max_connection_lifetime)
-    connection.pull(n=666, qid=777)
-    await connection.send_all()
-    tag, fields = await socket.pop_message()
-    assert tag == b"\x3F"
-    assert len(fields) == 1
-    assert fields[0] == {"n": 666, "qid": 777}
-
-
-@mark_async_test
-async def test_hello_passes_routing_metadata(fake_socket_pair):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    sockets = fake_socket_pair(address,
-                               packer_cls=AsyncBolt5x1.PACKER_CLS,
-                               unpacker_cls=AsyncBolt5x1.UNPACKER_CLS)
-    await sockets.server.send_message(b"\x70", {"server": "Neo4j/4.4.0"})
-    await sockets.server.send_message(b"\x70", {})
+async def test_hello_passes_routing_metadata(hello_ok_sockets, address):
+    sockets = hello_ok_sockets
     connection = AsyncBolt5x1(
-        address, sockets.client, PoolConfig.max_connection_lifetime,
+        address, sockets.client, MAX_CONNECTION_LIFETIME,
         routing_context={"foo": "bar"}
     )
     await connection.hello()
     tag, fields = await sockets.server.pop_message()
-    assert tag == b"\x01"
+    assert tag == TAG_HELLO
     assert len(fields) == 1
     assert fields[0]["routing"] == {"foo": "bar"}
 
 
+LOGON_KEYS = ("scheme", "principal", "credentials")
+_get_logon_values = attrgetter(*LOGON_KEYS)
+
+
 async def _assert_logon_message(sockets, auth):
     tag, fields = await sockets.server.pop_message()
-    assert tag == b"\x6A"  # LOGON
+    assert tag == TAG_LOGON
     assert len(fields) == 1
-    keys = ["scheme", "principal", "credentials"]
-    assert list(fields[0].keys()) == keys
-    for key in keys:
-        assert fields[0][key] == getattr(auth, key)
+    assert tuple(fields[0].keys()) == LOGON_KEYS
+    assert tuple(fields[0].values()) == _get_logon_values(auth)
 
 
 @mark_async_test
-async def test_hello_pipelines_logon(fake_socket_pair):
-    auth = neo4j.Auth("basic", "alice123", "supersecret123")
-    address = neo4j.Address(("127.0.0.1", 7687))
-    sockets = fake_socket_pair(address,
-                               packer_cls=AsyncBolt5x1.PACKER_CLS,
-                               unpacker_cls=AsyncBolt5x1.UNPACKER_CLS)
-    await sockets.server.send_message(
-        b"\x7F", {"code": "Neo.DatabaseError.General.MadeUpError",
-                  "message": "kthxbye"}
-    )
+async def test_hello_pipelines_logon(failure_sockets, address):
+    sockets = failure_sockets
     connection = AsyncBolt5x1(
-        address, sockets.client, PoolConfig.max_connection_lifetime, auth=auth
+        address, sockets.client, MAX_CONNECTION_LIFETIME, auth=AUTH
     )
     with pytest.raises(neo4j.exceptions.Neo4jError):
         await connection.hello()
     tag, fields = await sockets.server.pop_message()
-    assert tag == b"\x01"  # HELLO
+    assert tag == TAG_HELLO
     assert len(fields) == 1
     assert list(fields[0].keys()) == ["user_agent"]
-    assert auth.credentials not in repr(fields)
-    await _assert_logon_message(sockets, auth)
+    assert AUTH.credentials not in repr(fields)
+    await _assert_logon_message(sockets, AUTH)
 
 
 @mark_async_test
-async def test_logon(fake_socket_pair):
-    auth = neo4j.Auth("basic", "alice123", "supersecret123")
-    address = neo4j.Address(("127.0.0.1", 7687))
-    sockets = fake_socket_pair(address,
-                               packer_cls=AsyncBolt5x1.PACKER_CLS,
-                               unpacker_cls=AsyncBolt5x1.UNPACKER_CLS)
+async def test_logon(sockets, address):
     connection = AsyncBolt5x1(address, sockets.client,
-                              PoolConfig.max_connection_lifetime, auth=auth)
+                              MAX_CONNECTION_LIFETIME, auth=AUTH)
     connection.logon()
     await connection.send_all()
-    await _assert_logon_message(sockets, auth)
+    await _assert_logon_message(sockets, AUTH)
 
 
 @mark_async_test
-async def test_re_auth(fake_socket_pair, mocker, static_auth):
-    auth = neo4j.Auth("basic", "alice123", "supersecret123")
-    auth_manager = static_auth(auth)
-    address = neo4j.Address(("127.0.0.1", 7687))
-    sockets = fake_socket_pair(address,
-                               packer_cls=AsyncBolt5x1.PACKER_CLS,
-                               unpacker_cls=AsyncBolt5x1.UNPACKER_CLS)
-    await sockets.server.send_message(
-        b"\x7F", {"code": "Neo.DatabaseError.General.MadeUpError",
-                  "message": "kthxbye"}
-    )
-    connection = AsyncBolt5x1(address, sockets.client,
-                              PoolConfig.max_connection_lifetime)
-    connection.pool = mocker.AsyncMock()
-    connection.re_auth(auth, auth_manager)
+async def test_re_auth(failure_sockets, address, noop_pool, static_auth):
+    auth_manager = static_auth(AUTH)
+    sockets = failure_sockets
+    connection = AsyncBolt5x1(address, sockets.client, MAX_CONNECTION_LIFETIME)
+    connection.pool = noop_pool
+    connection.re_auth(AUTH, auth_manager)
     await connection.send_all()
     with pytest.raises(neo4j.exceptions.Neo4jError):
         await connection.fetch_all()
     tag, fields = await sockets.server.pop_message()
-    assert tag == b"\x6B"  # LOGOFF
+    assert tag == TAG_LOGOFF
     assert len(fields) == 0
-    await _assert_logon_message(sockets, auth)
-    assert connection.auth is auth
+    await _assert_logon_message(sockets, AUTH)
+    assert connection.auth is AUTH
     assert connection.auth_manager is auth_manager
 
 
 @mark_async_test
-async def test_logoff(fake_socket_pair):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    sockets = fake_socket_pair(address,
-                               packer_cls=AsyncBolt5x1.PACKER_CLS,
-                               unpacker_cls=AsyncBolt5x1.UNPACKER_CLS)
-    await sockets.server.send_message(b"\x70", {})
-    connection = AsyncBolt5x1(address, sockets.client,
-                              PoolConfig.max_connection_lifetime)
+async def test_logoff(sockets, address):
+    sockets.server.send_prepacked(SUCCESS_BYTES)
+    connection = AsyncBolt5x1(address, sockets.client, MAX_CONNECTION_LIFETIME)
     connection.logoff()
     assert not sockets.server.recv_buffer  # pipelined, so no response yet
     await connection.send_all()
     assert sockets.server.recv_buffer  # now!
     tag, fields = await sockets.server.pop_message()
-    assert tag == b"\x6B"  # LOGOFF
+    assert tag == TAG_LOGOFF
     assert len(fields) == 0
 
 
-@pytest.mark.parametrize(("hints", "valid"), (
+RECV_TIMEOUT_HINTS: t.Tuple[t.Tuple[t.Dict[str, t.Any], bool], ...] = (
     ({"connection.recv_timeout_seconds": 1}, True),
     ({"connection.recv_timeout_seconds": 42}, True),
     ({}, True),
@@ -341,41 +326,44 @@ async def test_logoff(fake_socket_pair):
     ({"connection.recv_timeout_seconds": None}, False),
     ({"connection.recv_timeout_seconds": False}, False),
     ({"connection.recv_timeout_seconds": "1"}, False),
-))
+)
+
+
 @mark_async_test
 async def test_hint_recv_timeout_seconds(
-    fake_socket_pair, hints, valid, caplog, mocker
+    sockets, address, capture_neo4j_log, mocker
 ):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    sockets = fake_socket_pair(address,
-                               packer_cls=AsyncBolt5x1.PACKER_CLS,
-                               unpacker_cls=AsyncBolt5x1.UNPACKER_CLS)
-    sockets.client.settimeout = mocker.Mock()
-    await sockets.server.send_message(
-        b"\x70", {"server": "Neo4j/4.3.4", "hints": hints}
-    )
-    await sockets.server.send_message(b"\x70", {})
-    connection = AsyncBolt5x1(
-        address, sockets.client, PoolConfig.max_connection_lifetime
-    )
-    with caplog.at_level(logging.INFO):
+    # all cases share one socket pair, each with a fresh connection
+    settimeout = sockets.client.settimeout = mocker.Mock()
+    neo4j_log = capture_neo4j_log(logging.INFO)
+    for hints, valid in RECV_TIMEOUT_HINTS:
+        case = (hints, valid)
+        settimeout.reset_mock()
+        neo4j_log.records.clear()
+        await sockets.server.send_message(
+            TAG_SUCCESS, {"server": "Neo4j/4.3.4", "hints": hints}
+        )
+        sockets.server.send_prepacked(SUCCESS_BYTES)
+        connection = AsyncBolt5x1(
+            address, sockets.client, MAX_CONNECTION_LIFETIME
+        )
         await connection.hello()
-    if valid:
-        if "connection.recv_timeout_seconds" in hints:
-            sockets.client.settimeout.assert_called_once_with(
-                hints["connection.recv_timeout_seconds"]
-            )
+        if valid:
+            if "connection.recv_timeout_seconds" in hints:
+                assert settimeout.call_args_list == [
+                    mocker.call(hints["connection.recv_timeout_seconds"])
+                ], case
+            else:
+                assert not settimeout.called, case
+            assert not any("recv_timeout_seconds" in msg
+                           and "invalid" in msg
+                           for msg in neo4j_log.messages), case
         else:
-            sockets.client.settimeout.assert_not_called()
-        assert not any("recv_timeout_seconds" in msg
+            assert not settimeout.called, case
+            assert any(repr(hints["connection.recv_timeout_seconds"]) in msg
+                       and "recv_timeout_seconds" in msg
                        and "invalid" in msg
-                       for msg in caplog.messages)
-    else:
-        sockets.client.settimeout.assert_not_called()
-        assert any(repr(hints["connection.recv_timeout_seconds"]) in msg
-                   and "recv_timeout_seconds" in msg
-                   and "invalid" in msg
-                   for msg in caplog.messages)
+                       for msg in neo4j_log.messages), case
 
 
 CREDENTIALS = "+++super-secret-sauce+++"
@@ -390,33 +378,27 @@ CREDENTIALS = "+++super-secret-sauce+++"
     neo4j.Auth("scheme", "principal", CREDENTIALS, "realm", foo="bar"),
 ))
 @mark_async_test
-async def test_credentials_are_not_logged(auth, fake_socket_pair, caplog):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    sockets = fake_socket_pair(address,
-                               packer_cls=AsyncBolt5x1.PACKER_CLS,
-                               unpacker_cls=AsyncBolt5x1.UNPACKER_CLS)
-    await sockets.server.send_message(b"\x70", {"server": "Neo4j/4.3.4"})
-    await sockets.server.send_message(b"\x70", {})
+async def test_credentials_are_not_logged(
+    auth, hello_ok_sockets, address, capture_neo4j_log
+):
+    sockets = hello_ok_sockets
     connection = AsyncBolt5x1(
-        address, sockets.client, PoolConfig.max_connection_lifetime, auth=auth
+        address, sockets.client, MAX_CONNECTION_LIFETIME, auth=auth
     )
-    with caplog.at_level(logging.DEBUG):
-        await connection.hello()
+    neo4j_log = capture_neo4j_log(logging.DEBUG)
+    await connection.hello()
+    log_bytes = "\n".join(neo4j_log.messages).encode()
 
+    assert CREDENTIALS.encode() not in log_bytes
     if isinstance(auth, tuple):
         auth = neo4j.basic_auth(*auth)
     for field in ("scheme", "principal", "realm", "parameters"):
         value = getattr(auth, field, None)
         if value:
-            assert repr(value) in caplog.text
-    assert CREDENTIALS not in caplog.text
+            assert repr(value).encode() in log_bytes
 
 
-@pytest.mark.parametrize(("method", "args"), (
-    ("run", ("RETURN 1",)),
-    ("begin", ()),
-))
-@pytest.mark.parametrize("kwargs", (
+NOTIFICATION_FILTER_KWARGS: t.Tuple[t.Dict[str, t.Any], ...] = (
     {"notifications_min_severity": "WARNING"},
     {"notifications_disabled_categories": ["HINT"]},
     {"notifications_disabled_categories": []},
@@ -424,36 +406,26 @@ async def test_credentials_are_not_logged(auth, fake_socket_pair, caplog):
         "notifications_min_severity": "WARNING",
         "notifications_disabled_categories": ["HINT"]
     },
+)
+
+
+@pytest.mark.parametrize(("method", "args"), (
+    ("run", ("RETURN 1",)),
+    ("begin", ()),
 ))
-def test_does_not_support_notification_filters(fake_socket, method,
+@pytest.mark.parametrize("kwargs", NOTIFICATION_FILTER_KWARGS)
+def test_does_not_support_notification_filters(dummy_conn, method,
                                                args, kwargs):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(address, socket,
-                            PoolConfig.max_connection_lifetime)
-    method = getattr(connection, method)
+    method = getattr(dummy_conn, method)
     with pytest.raises(ConfigurationError, match="Notification filtering"):
         method(*args, **kwargs)
 
 
+@pytest.mark.parametrize("kwargs", NOTIFICATION_FILTER_KWARGS)
 @mark_async_test
-@pytest.mark.parametrize("kwargs", (
-    {"notifications_min_severity": "WARNING"},
-    {"notifications_disabled_categories": ["HINT"]},
-    {"notifications_disabled_categories": []},
-    {
-        "notifications_min_severity": "WARNING",
-        "notifications_disabled_categories": ["HINT"]
-    },
-))
 async def test_hello_does_not_support_notification_filters(
-    fake_socket, kwargs
+    make_conn, kwargs
 ):
-    address = neo4j.Address(("127.0.0.1", 7687))
-    socket = fake_socket(address, AsyncBolt5x1.UNPACKER_CLS)
-    connection = AsyncBolt5x1(
-        address, socket, PoolConfig.max_connection_lifetime,
-        **kwargs
-    )
+    connection, _ = make_conn(**kwargs)
     with pytest.raises(ConfigurationError, match="Notification filtering"):
         await connection.hello()
@@ -76,7 +76,7 @@ async def test_extra_in_begin(fake_socket, args, kwargs, expected_fields):
     await connection.send_all()
     tag, is_fields = await socket.pop_message()
     assert tag == b"\x11"
-    assert tuple(is_fields) == expected_fields
+    assert is_fields == expected_fields
 
 
 @pytest.mark.parametrize(("args", "kwargs", "expected_fields"), (
@@ -97,7 +97,7 @@ async def test_extra_in_run(fake_socket, args, kwargs, expected_fields):
     await connection.send_all()
     tag, is_fields = await socket.pop_message()
     assert tag == b"\x10"
-    assert tuple(is_fields) == expected_fields
+    assert is_fields == expected_fields
 
 
 @mark_async_test
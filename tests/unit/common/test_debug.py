@@ -47,9 +47,9 @@ def logger_mocker(mocker) -> _TSetupMockProtocol:
     def setup_mock(*logger_names):
         loggers = [logging.getLogger(name) for name in logger_names]
         for logger in loggers:
-            logger.addHandler = mocker.Mock()
-            logger.removeHandler = mocker.Mock()
-            logger.setLevel = mocker.Mock()
+            mocker.patch.object(logger, "addHandler")
+            mocker.patch.object(logger, "removeHandler")
+            mocker.patch.object(logger, "setLevel")
         return loggers
 
     return setup_mock
@@ -220,6 +220,7 @@ def _assert_task_injection(
     handler_cls_mock = mocker.patch("neo4j.debug.StreamHandler", autospec=True)
     handler_mock = handler_cls_mock.return_value
     logger_name = "neo4j"
+    logger_mocker(logger_name)
     watcher = neo4j_debug.Watcher(logger_name, colour=colour,
                                   thread_info=thread, task_info=task)
     record_mock = mocker.Mock(spec=logging.LogRecord)
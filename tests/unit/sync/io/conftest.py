@@ -64,7 +64,8 @@ class FakeSocket:
 
     def pop_message(self):
         assert self.messages
-        return self.messages.pop(None)
+        tag, fields = self.messages.pop(None)
+        return tag, tuple(fields)
 
 
 class FakeSocket2:
@@ -120,6 +121,18 @@ class FakeSocket2:
         self._outbox.append_message(tag, fields, None)
         self._outbox.flush()
 
+    def send_prepacked(self, data):
+        assert callable(self.on_send)
+        self.on_send(data)
+
+
+def prepack_message(packer_cls, tag, *fields):
+    buffer = packer_cls.new_packable_buffer()
+    packer_cls(buffer).pack_struct(tag, fields)
+    data = bytes(buffer.data)
+    assert len(data) <= 0xFFFF  # fits a single chunk
+    return struct_pack(">H", len(data)) + data + b"\x00\x00"
+
 
 class FakeSocketPair:
 
@@ -134,7 +147,7 @@ class FakeSocketPair:
         self.server.on_send = self.client.inject
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fake_socket():
     return FakeSocket
 